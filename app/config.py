@@ -1,8 +1,45 @@
-﻿from pydantic_settings import BaseSettings
+﻿from urllib.parse import parse_qsl, urlencode
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings
+
+# libpq connection parameters asyncpg.connect() has no keyword for. SQLAlchemy
+# passes URL query parameters straight through as connect() keywords, so these
+# would fail at the first connection instead of at startup.
+LIBPQ_ONLY_PARAMS = frozenset({
+    "application_name", "channel_binding", "client_encoding", "connect_timeout",
+    "fallback_application_name", "gssencmode", "keepalives", "keepalives_count",
+    "keepalives_idle", "keepalives_interval", "options", "requiressl", "service",
+    "sslcert", "sslcompression", "sslcrl", "sslkey", "sslpassword", "sslrootcert",
+    "tcp_user_timeout",
+})
 
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    @field_validator("DATABASE_URL")
+    @classmethod
+    def use_asyncpg(cls, url: str) -> str:
+        # Always talk to Postgres through asyncpg (binary protocol), whatever
+        # driver the URL names.
+        scheme, _, rest = url.partition("://")
+        if not (scheme in ("postgres", "postgresql") or scheme.startswith("postgresql+")):
+            return url
+        location, sep, query = rest.partition("?")
+        params = parse_qsl(query, keep_blank_values=True)
+        unsupported = sorted({key for key, _ in params if key in LIBPQ_ONLY_PARAMS})
+        if unsupported:
+            raise ValueError(
+                f"DATABASE_URL uses libpq-only parameters asyncpg does not accept: "
+                f"{', '.join(unsupported)}; remove them from the URL"
+            )
+        keys = [key for key, _ in params]
+        if "sslmode" in keys and "ssl" in keys:
+            raise ValueError("DATABASE_URL sets both sslmode and ssl; keep one")
+        # asyncpg takes libpq's sslmode values (disable ... verify-full) as ssl=
+        params = [("ssl" if key == "sslmode" else key, value) for key, value in params]
+        return f"postgresql+asyncpg://{location}{sep}{urlencode(params)}"
+
     class Config:
         env_file = ".env"
 
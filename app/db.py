@@ -1,10 +1,31 @@
-﻿from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+﻿import asyncio
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.config import settings
 
+POOL_SIZE = 20
+
+def _json_dumps(value) -> str:
+    return orjson.dumps(value).decode("utf-8")
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     future=True,
     echo=False,
+    # JSONB columns (response_headers, payload) go through orjson
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    pool_size=POOL_SIZE,
+    max_overflow=20,
+    pool_recycle=1800,
+    connect_args={
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+        # asyncpg's type introspection queries are slow under the JIT
+        "server_settings": {"jit": "off"},
+    },
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -15,3 +36,11 @@ AsyncSessionLocal = async_sessionmaker(
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def warm_pool(n: int = POOL_SIZE) -> None:
+    """Open n pooled connections up front so first requests skip the handshake."""
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(n)))
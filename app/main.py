@@ -1,9 +1,30 @@
-﻿from fastapi import FastAPI
+﻿from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from app.db import warm_pool
 from app.routers.sources import router as sources_router
 from app.routers.captures import router as captures_router
 from app.routers.timelines import router as timelines_router
+from app.services import event_bus, fetcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_pool()
+    fetcher.start()
+    event_bus.start()
+    yield
+    await event_bus.stop()
+    await fetcher.stop()
+
 
-app = FastAPI(title="SourceRecord", version="0.1.0")
+app = FastAPI(
+    title="SourceRecord",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.include_router(sources_router)
 app.include_router(captures_router)
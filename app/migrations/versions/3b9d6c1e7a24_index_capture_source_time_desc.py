@@ -0,0 +1,28 @@
+"""index: capture source time desc
+
+Revision ID: 3b9d6c1e7a24
+Revises: 8f22b341d45f
+Create Date: 2026-10-15 09:12:27.514203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d6c1e7a24'
+down_revision: Union[str, None] = '8f22b341d45f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_capture_source_time', table_name='capture')
+    op.create_index('idx_capture_source_time_desc', 'capture', ['source_id', sa.text('captured_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_capture_source_time_desc', table_name='capture')
+    op.create_index('idx_capture_source_time', 'capture', ['source_id', 'captured_at'], unique=False)
@@ -1,4 +1,6 @@
-﻿import uuid
+﻿import os
+import time
+import uuid
 from sqlalchemy import (
     Boolean,
     CHAR,
@@ -10,11 +12,21 @@ from sqlalchemy import (
     UniqueConstraint,
     Index,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def uuid7() -> uuid.UUID:
+    # RFC 9562 v7: 48-bit unix ms timestamp, then random bits. Time-ordered ids
+    # keep inserts on the right edge of the primary key btree.
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return uuid.UUID(int=value)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -59,7 +71,7 @@ class Source(Base):
 class Capture(Base):
     __tablename__ = "capture"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     org_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("organization.id"), nullable=False)
     source_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("source.id"), nullable=False)
 
@@ -82,14 +94,14 @@ class Capture(Base):
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     __table_args__ = (
-        Index("idx_capture_source_time", "source_id", "captured_at"),
+        Index("idx_capture_source_time_desc", "source_id", text("captured_at DESC")),
     )
 
 
 class CaptureArtifact(Base):
     __tablename__ = "capture_artifact"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     capture_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("capture.id"), nullable=False)
 
     kind: Mapped[str] = mapped_column(Text, nullable=False)  # raw/html/text/headers
@@ -106,7 +118,7 @@ class CaptureArtifact(Base):
 class EventLog(Base):
     __tablename__ = "event_log"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     org_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("organization.id"), nullable=False)
 
     at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
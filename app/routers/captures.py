@@ -1,5 +1,4 @@
-﻿import hashlib
-import uuid
+﻿import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,17 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db import get_db
-from app.models import Source, Capture, CaptureArtifact, EventLog
+from app.models import Capture, CaptureArtifact, uuid7
 from app.schemas import CaptureOut
-from app.services.fetcher import fetch_url
+from app.services.event_bus import emit
+from app.services.fetcher import FetcherInternalError, fetch_url, sha256_hasher, sha256_hex
+from app.services.source_cache import get_source
 
 router = APIRouter(prefix="/sources", tags=["captures"])
 
 V1_ORG_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 
-def sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
-
 def compute_chain_sha256(
     prev_capture_id: str | None,
     prev_chain: str | None,
@@ -26,47 +24,49 @@ def compute_chain_sha256(
     captured_at_iso: str,
     canonical_url: str,
 ) -> str:
-    base = "|".join(
-        [
-            prev_capture_id or "",
-            prev_chain or "",
-            raw_sha,
-            norm_sha,
-            captured_at_iso,
-            canonical_url,
-        ]
-    )
-    return sha256_hex(base.encode("utf-8"))
+    # Same input as "|".join([...]).encode(), fed straight into the hasher
+    h = sha256_hasher()
+    h.update((prev_capture_id or "").encode("utf-8"))
+    h.update(b"|")
+    h.update((prev_chain or "").encode("utf-8"))
+    h.update(b"|")
+    h.update(raw_sha.encode("utf-8"))
+    h.update(b"|")
+    h.update(norm_sha.encode("utf-8"))
+    h.update(b"|")
+    h.update(captured_at_iso.encode("utf-8"))
+    h.update(b"|")
+    h.update(canonical_url.encode("utf-8"))
+    return h.hexdigest()
 
 
 @router.post("/{source_id}/captures", response_model=CaptureOut)
 async def create_capture(source_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    # Load source
-    res = await db.execute(
-        select(Source).where(Source.id == source_id, Source.org_id == V1_ORG_ID)
-    )
-    source = res.scalar_one_or_none()
-    if not source:
+    source = await get_source(db, source_id)
+    if source is None or source.org_id != V1_ORG_ID:
         raise HTTPException(status_code=404, detail="Source not found")
+    canonical_url = source.canonical_url
 
-    # Find previous capture for chain linking
+    # Find previous capture for chain linking (org is implied by the source;
+    # served by idx_capture_source_time_desc)
     prev = await db.execute(
-        select(Capture)
-        .where(Capture.source_id == source_id, Capture.org_id == V1_ORG_ID)
+        select(Capture.id, Capture.chain_sha256)
+        .where(Capture.source_id == source_id)
         .order_by(Capture.captured_at.desc())
         .limit(1)
     )
-    prev_cap = prev.scalar_one_or_none()
-    prev_chain = prev_cap.chain_sha256 if prev_cap else None
-    prev_id = prev_cap.id if prev_cap else None
+    prev_id, prev_chain = prev.first() or (None, None)
 
     captured_at = datetime.now(timezone.utc)
     captured_at_iso = captured_at.isoformat()
 
     try:
-        fetched = await fetch_url(source.canonical_url)
+        fetched = await fetch_url(canonical_url)
         fetch_status = int(fetched["status"])
         fetch_error = None
+    except FetcherInternalError:
+        # Our own failure, not the page's: record nothing and surface a 500
+        raise
     except Exception as e:
         # Append-only failure event (still a capture row)
         fetched = {
@@ -77,7 +77,6 @@ async def create_capture(source_id: uuid.UUID, db: AsyncSession = Depends(get_db
             "raw_bytes_sha256": sha256_hex(b""),
             "normalized_text_sha256": sha256_hex(b""),
             "normalized_text_len": 0,
-            "normalized_text": "",
         }
         fetch_status = 0
         fetch_error = repr(e)
@@ -88,11 +87,15 @@ async def create_capture(source_id: uuid.UUID, db: AsyncSession = Depends(get_db
         raw_sha=fetched["raw_bytes_sha256"],
         norm_sha=fetched["normalized_text_sha256"],
         captured_at_iso=captured_at_iso,
-        canonical_url=source.canonical_url,
+        canonical_url=canonical_url,
     )
 
 
+    # Client-side id so the capture and its artifacts can be inserted in a
+    # single flush at commit time.
+    cap_id = uuid7()
     cap = Capture(
+        id=cap_id,
         org_id=V1_ORG_ID,
         source_id=source_id,
         captured_at=captured_at,
@@ -108,45 +111,42 @@ async def create_capture(source_id: uuid.UUID, db: AsyncSession = Depends(get_db
         prev_capture_id=prev_id,
         chain_sha256=chain_sha,
     )
-    db.add(cap)
-    await db.flush()
 
     # v1 artifacts: store local placeholders (S3 later)
     # we keep DB shape stable now
     db.add_all([
+        cap,
         CaptureArtifact(
-            capture_id=cap.id,
+            capture_id=cap_id,
             kind="raw",
             bucket="local",
-            object_key=f"data/artifacts/{cap.id}/raw.bin",
+            object_key=f"data/artifacts/{cap_id}/raw.bin",
             bytes=0,
             sha256=fetched["raw_bytes_sha256"],
         ),
         CaptureArtifact(
-            capture_id=cap.id,
+            capture_id=cap_id,
             kind="text",
             bucket="local",
-            object_key=f"data/artifacts/{cap.id}/text.txt",
+            object_key=f"data/artifacts/{cap_id}/text.txt",
             bytes=0,
             sha256=fetched["normalized_text_sha256"],
         ),
     ])
 
-    db.add(
-        EventLog(
-            org_id=V1_ORG_ID,
-            actor_user_id=None,
-            event_type="capture.created" if fetch_error is None else "capture.failed",
-            entity_type="capture",
-            entity_id=cap.id,
-            payload={"source_id": str(source_id), "fetch_status": fetch_status},
-        )
-    )
-
     await db.commit()
 
-    return CaptureOut(
-        id=str(cap.id),
+    await emit({
+        "org_id": V1_ORG_ID,
+        "actor_user_id": None,
+        "event_type": "capture.created" if fetch_error is None else "capture.failed",
+        "entity_type": "capture",
+        "entity_id": cap_id,
+        "payload": {"source_id": str(source_id), "fetch_status": fetch_status},
+    })
+
+    return CaptureOut.model_construct(
+        id=str(cap_id),
         source_id=str(source_id),
         captured_at=captured_at_iso,
         fetch_status=fetch_status,
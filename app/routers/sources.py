@@ -1,11 +1,12 @@
 ﻿import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db import get_db
-from app.models import Source, EventLog
+from app.models import Source
 from app.schemas import SourceCreate, SourceOut
+from app.services.event_bus import emit
 from app.services.normalize import canonicalize_url
 
 router = APIRouter(prefix="/sources", tags=["sources"])
@@ -17,32 +18,34 @@ V1_ORG_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 async def create_source(payload: SourceCreate, db: AsyncSession = Depends(get_db)):
     canonical = canonicalize_url(str(payload.url))
 
-    existing = await db.execute(
-        select(Source).where(Source.org_id == V1_ORG_ID, Source.canonical_url == canonical)
-    )
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=409, detail="Source already exists")
-
-    s = Source(
-        org_id=V1_ORG_ID,
-        url=str(payload.url),
-        canonical_url=canonical,
-        title=None,
-        created_by=None,
-    )
-    db.add(s)
-    await db.flush()  # get s.id
+    url = str(payload.url)
 
-    db.add(
-        EventLog(
+    # One round trip; the unique constraint decides duplicates, race-free
+    res = await db.execute(
+        pg_insert(Source)
+        .values(
             org_id=V1_ORG_ID,
-            actor_user_id=None,
-            event_type="source.created",
-            entity_type="source",
-            entity_id=s.id,
-            payload={"url": s.url, "canonical_url": s.canonical_url},
+            url=url,
+            canonical_url=canonical,
+            title=None,
+            created_by=None,
         )
+        .on_conflict_do_nothing(index_elements=["org_id", "canonical_url"])
+        .returning(Source.id)
     )
+    source_id = res.scalar_one_or_none()
+    if source_id is None:
+        raise HTTPException(status_code=409, detail="Source already exists")
 
     await db.commit()
-    return SourceOut(id=str(s.id), url=s.url, canonical_url=s.canonical_url)
+
+    await emit({
+        "org_id": V1_ORG_ID,
+        "actor_user_id": None,
+        "event_type": "source.created",
+        "entity_type": "source",
+        "entity_id": source_id,
+        "payload": {"url": url, "canonical_url": canonical},
+    })
+
+    return SourceOut.model_construct(id=str(source_id), url=url, canonical_url=canonical)
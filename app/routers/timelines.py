@@ -4,36 +4,45 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db import get_db
-from app.models import Source, Capture
+from app.models import Capture
 from app.schemas import TimelineOut, TimelineItem
+from app.services.source_cache import get_source
 
 router = APIRouter(prefix="/sources", tags=["timeline"])
 V1_ORG_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 
 @router.get("/{source_id}/timeline", response_model=TimelineOut)
 async def get_timeline(source_id: uuid.UUID, limit: int = 50, db: AsyncSession = Depends(get_db)):
-    res = await db.execute(select(Source).where(Source.id == source_id, Source.org_id == V1_ORG_ID))
-    if not res.scalar_one_or_none():
+    source = await get_source(db, source_id)
+    if source is None or source.org_id != V1_ORG_ID:
         raise HTTPException(status_code=404, detail="Source not found")
 
+    # Only the columns the response needs; skips ORM hydration and the
+    # response_headers JSONB decode.
     rows = await db.execute(
-        select(Capture)
-        .where(Capture.source_id == source_id, Capture.org_id == V1_ORG_ID)
+        select(
+            Capture.id,
+            Capture.captured_at,
+            Capture.fetch_status,
+            Capture.raw_bytes_sha256,
+            Capture.normalized_text_sha256,
+            Capture.chain_sha256,
+        )
+        .where(Capture.source_id == source_id)
         .order_by(Capture.captured_at.desc())
         .limit(limit)
     )
-    captures = rows.scalars().all()
 
     items = [
-        TimelineItem(
-            id=str(c.id),
-            captured_at=c.captured_at.isoformat(),
-            fetch_status=c.fetch_status,
-            raw_bytes_sha256=c.raw_bytes_sha256,
-            normalized_text_sha256=c.normalized_text_sha256,
-            chain_sha256=c.chain_sha256,
+        TimelineItem.model_construct(
+            id=str(id_),
+            captured_at=captured_at.isoformat(),
+            fetch_status=fetch_status,
+            raw_bytes_sha256=raw_sha,
+            normalized_text_sha256=norm_sha,
+            chain_sha256=chain_sha,
         )
-        for c in captures
+        for id_, captured_at, fetch_status, raw_sha, norm_sha, chain_sha in rows
     ]
 
-    return TimelineOut(source_id=str(source_id), items=items)
+    return TimelineOut.model_construct(source_id=str(source_id), items=items)
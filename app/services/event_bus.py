@@ -0,0 +1,120 @@
+import asyncio
+import logging
+
+import orjson
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import insert
+
+from app.db import AsyncSessionLocal
+from app.models import EventLog
+
+logger = logging.getLogger(__name__)
+# One JSON line per event_log row that could not be written, for replay
+dead_letter_logger = logging.getLogger(f"{__name__}.dead_letter")
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL_S = 0.05
+RETRY_INITIAL_S = 0.5
+RETRY_MAX_S = 30.0
+STOP_TIMEOUT_S = 10.0
+
+# Audit events are written off the request path: routers enqueue EventLog
+# rows and a background task bulk-inserts them. Without that task (app used
+# outside its lifespan, or once stop() has begun) emit() writes inline.
+_queue: asyncio.Queue | None = None
+_task: asyncio.Task | None = None
+_stopping: asyncio.Event | None = None
+_stop_deadline: float | None = None
+_STOP = object()
+
+async def emit(event: dict) -> None:
+    if _task is None or _task.done() or _stopping.is_set():
+        await _insert([event])
+        return
+    await _queue.put(event)
+
+async def _insert(events: list[dict]) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(EventLog), events)
+        await session.commit()
+
+def _is_transient(e: Exception) -> bool:
+    # Lost connections, an unreachable server and pool timeouts clear up on
+    # their own; anything else (bad row, constraint, schema) fails every retry.
+    if isinstance(e, sa_exc.DBAPIError):
+        return e.connection_invalidated or isinstance(e, sa_exc.OperationalError)
+    return isinstance(e, (OSError, sa_exc.TimeoutError))
+
+def _dead_letter(events: list[dict], e: Exception) -> None:
+    logger.error("dead-lettering %d event_log rows: %r", len(events), e)
+    for event in events:
+        dead_letter_logger.error("%s", orjson.dumps(event, default=str).decode("utf-8"))
+
+async def _write(events: list[dict]) -> None:
+    # The event log is append-only: transient failures are retried with
+    # backoff, a batch that fails outright is split until the bad rows are
+    # isolated, and only those are dead-lettered. Once stop() has begun,
+    # retrying ends at its deadline.
+    loop = asyncio.get_running_loop()
+    delay = RETRY_INITIAL_S
+    while True:
+        remaining = None if _stop_deadline is None else _stop_deadline - loop.time()
+        try:
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("event bus stop deadline passed")
+            await asyncio.wait_for(_insert(events), remaining)
+            return
+        except Exception as e:
+            if not _is_transient(e):
+                if len(events) == 1:
+                    _dead_letter(events, e)
+                    return
+                mid = len(events) // 2
+                await _write(events[:mid])
+                await _write(events[mid:])
+                return
+            if _stop_deadline is not None and loop.time() >= _stop_deadline:
+                _dead_letter(events, e)
+                return
+            logger.warning(
+                "failed to write %d event_log rows (%r); retrying in %.1f s", len(events), e, delay
+            )
+        if _stopping.is_set():
+            await asyncio.sleep(min(delay, max(_stop_deadline - loop.time(), 0)))
+        else:
+            # Sleep out the backoff, but wake early when stop() begins
+            try:
+                await asyncio.wait_for(_stopping.wait(), delay)
+            except TimeoutError:
+                pass
+        delay = min(delay * 2, RETRY_MAX_S)
+
+async def _run(queue: asyncio.Queue) -> None:
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(FLUSH_INTERVAL_S)
+        while len(batch) < BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        events = [e for e in batch if e is not _STOP]
+        if events:
+            await _write(events)
+        if len(events) != len(batch):
+            return
+
+def start() -> None:
+    global _queue, _task, _stopping, _stop_deadline
+    _queue = asyncio.Queue(maxsize=10000)
+    _stopping = asyncio.Event()
+    _stop_deadline = None
+    _task = asyncio.create_task(_run(_queue))
+
+async def stop() -> None:
+    global _queue, _task, _stopping, _stop_deadline
+    # Queued behind everything already emitted, so _run() drains those first;
+    # after STOP_TIMEOUT_S whatever still can't be written is dead-lettered
+    _stop_deadline = asyncio.get_running_loop().time() + STOP_TIMEOUT_S
+    _stopping.set()
+    await _queue.put(_STOP)
+    await _task
+    _queue = _task = _stopping = _stop_deadline = None
@@ -1,33 +1,143 @@
-﻿import hashlib
+﻿import asyncio
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import httpx
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+# hashlib's sha256 is the OpenSSL implementation, which dispatches to the
+# SHA-NI / ARMv8 SHA2 instructions when the CPU has them. Bind it once.
+_sha256 = hashlib.sha256
+
+def sha256_hasher():
+    # Incremental hasher for callers that feed a digest in pieces
+    return _sha256()
 
 def sha256_hex(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+    h = _sha256()
+    h.update(memoryview(data))
+    return h.hexdigest()
+
+# One pooled HTTP/2 client for the whole process so repeat captures of a host
+# reuse the TCP+TLS connection instead of handshaking every time. HTML parsing
+# and hashing are CPU-bound; they run in worker processes so a large page
+# doesn't stall the event loop for every other request. Both are created by
+# start() from the app lifespan, so each lifespan gets fresh ones.
+_client: httpx.AsyncClient | None = None
+_cpu_pool: ProcessPoolExecutor | None = None
+
+class FetcherInternalError(RuntimeError):
+    """Failure inside SourceRecord itself, as opposed to fetching the page."""
+
+def _new_cpu_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+def start() -> None:
+    global _client, _cpu_pool
+    _client = httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=30,
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+        headers={"User-Agent": "SourceRecord/0.1"},
+    )
+    _cpu_pool = _new_cpu_pool()
+
+async def stop() -> None:
+    global _client, _cpu_pool
+    await _client.aclose()
+    _cpu_pool.shutdown()
+    _client = _cpu_pool = None
+
+async def _run_in_cpu_pool(fn, *args):
+    global _cpu_pool
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _cpu_pool
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM on a huge page, a crash in lexbor) and took
+            # the pool with it. Replace it, unless a concurrent request
+            # already has, and retry once.
+            if attempt:
+                raise
+            if _cpu_pool is pool:
+                pool.shutdown(wait=False)
+                _cpu_pool = _new_cpu_pool()
+
+def normalize_html_to_text(html: bytes) -> bytes:
+    # Not byte-for-byte the old html.parser output: raw-text elements, CDATA
+    # and text after </html> differ (see README, "Text normalization").
+    try:
+        tree = LexborHTMLParser(html.decode("utf-8-sig"))
+    except UnicodeDecodeError:
+        # lexbor only understands UTF-8; let BeautifulSoup sniff the charset
+        return _normalize_html_to_text_bs4(html)
+    if tree.head is not None and tree.head.css_first("noscript") is not None:
+        # lexbor parses with scripting off, so text or body markup inside a
+        # <noscript> in <head> is moved out of the element into <body>, where
+        # it can't be told apart from page text. html.parser keeps it inside.
+        return _normalize_html_to_text_bs4(html)
+    for node in tree.css("script, style, noscript"):
+        node.decompose()
+    text = tree.root.text(separator=" ") if tree.root else ""
+    return " ".join(text.split()).encode("utf-8")
 
-def normalize_html_to_text(html: bytes) -> str:
+def _normalize_html_to_text_bs4(html: bytes) -> bytes:
     soup = BeautifulSoup(html, "html.parser")
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
     text = soup.get_text(separator=" ")
-    text = " ".join(text.split())
-    return text.strip()
+    return " ".join(text.split()).encode("utf-8")
+
+def normalize_body(raw: bytes, content_type: str | None) -> bytes:
+    # Per-type rules; see README, "Text normalization"
+    ct = (content_type or "").split(";", 1)[0].strip().lower()
+    if not ct or ct in ("text/html", "application/xhtml+xml"):
+        return normalize_html_to_text(raw)
+    if ct in ("text/xml", "application/xml") or ct.endswith("+xml"):
+        # XML (RSS, Atom, ...) keeps html.parser's tag stripping, which also
+        # keeps CDATA text that lexbor would drop
+        return _normalize_html_to_text_bs4(raw)
+    if ct.startswith("text/"):
+        return b" ".join(raw.split())
+    if ct == "application/json":
+        return raw
+    # Binary and unrecognized types: the raw bytes themselves, never the empty
+    # digest a failed fetch records
+    return raw
+
+def _process(raw: bytes, content_type: str | None) -> dict:
+    norm_text = normalize_body(raw, content_type)
+    return {
+        "raw_bytes_sha256": sha256_hex(raw),
+        "normalized_text_sha256": sha256_hex(norm_text),
+        "normalized_text_len": len(norm_text),
+    }
 
 async def fetch_url(url: str, timeout_s: int = 30) -> dict:
-    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout_s) as client:
-        r = await client.get(url, headers={"User-Agent": "SourceRecord/0.1"})
+    # Errors from the request itself propagate as-is; anything that goes
+    # wrong after the page arrived is ours and raised as FetcherInternalError.
+    if _client is None:
+        raise FetcherInternalError("fetcher not started; call fetcher.start() first")
+    r = await _client.get(url, timeout=timeout_s)
     raw = r.content
-    norm_text = normalize_html_to_text(raw).encode("utf-8")
+    content_type = r.headers.get("content-type")
+    try:
+        processed = await _run_in_cpu_pool(_process, raw, content_type)
+    except Exception as e:
+        raise FetcherInternalError(f"processing {url} failed: {e!r}") from e
 
     return {
         "status": r.status_code,
         "headers": dict(r.headers),
-        "content_type": r.headers.get("content-type"),
+        "content_type": content_type,
         "etag": r.headers.get("etag"),
         "last_modified": r.headers.get("last-modified"),
         "raw_bytes": raw,
-        "raw_bytes_sha256": sha256_hex(raw),
-        "normalized_text": norm_text.decode("utf-8"),
-        "normalized_text_sha256": sha256_hex(norm_text),
-        "normalized_text_len": len(norm_text),
+        **processed,
     }
@@ -1,5 +1,7 @@
-﻿from urllib.parse import urlsplit, urlunsplit
+﻿from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
 
+@lru_cache(maxsize=8192)
 def canonicalize_url(url: str) -> str:
     parts = urlsplit(url)
     scheme = parts.scheme.lower()
@@ -0,0 +1,24 @@
+import uuid
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Source
+
+# source_id -> (id, org_id, canonical_url). Sources are append-only and
+# misses are never stored, so no entry can go stale and nothing needs
+# invalidating; the TTL only bounds how long an entry lives.
+_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+async def get_source(db: AsyncSession, source_id: uuid.UUID) -> Row | None:
+    row = _cache.get(source_id)
+    if row is None:
+        res = await db.execute(
+            select(Source.id, Source.org_id, Source.canonical_url).where(Source.id == source_id)
+        )
+        row = res.first()
+        if row is not None:
+            _cache[source_id] = row
+    return row
@@ -11,16 +11,24 @@ Reads email_export.csv and slack_export.json, produces a ZIP with:
 - evidence/slack_summary.json
 """
 
+import argparse
 import csv
 import io
 import json
 import hashlib
 import os
 import re
+import sys
 import zipfile
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from io import BytesIO
+from itertools import accumulate
+from operator import itemgetter
 
 try:
     from reportlab.lib.pagesizes import letter
@@ -28,10 +36,16 @@ try:
     from reportlab.lib.units import inch
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
     from reportlab.lib import colors
+    from reportlab.pdfgen import canvas
 except ImportError:
     print("Error: reportlab is required. Install with: pip install reportlab")
     exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Constants
 SCRIPT_DIR = Path(__file__).parent
@@ -47,22 +61,91 @@ SLACK_JSON = DATA_DIR / "slack_export.json"
 PACK_ID = "IRP-8D504146"
 PREPARED_ON = "2024-02-15"
 ZIP_TIMESTAMP = (2024, 2, 15, 0, 0, 0)  # Fixed timestamp for all ZIP entries
+ZIP_CHUNK_SIZE = 1024 * 1024  # Bytes fed to the compressor per write
+PDF_DATE = "D:20240215000000-05'00'"  # Fixed CreationDate/ModDate
+PARALLEL_MIN_EMAILS = 5000  # Below this, worker startup costs more than it saves
+
+# PDF styles are immutable during a build, so they are created once at import
+PDF_STYLES = getSampleStyleSheet()
+
+# Title style
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=PDF_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#000000'),
+    spaceAfter=30,
+    alignment=1  # Center
+)
+
+# Heading style
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=PDF_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#000000'),
+    spaceAfter=12,
+    spaceBefore=12
+)
+
+# Shared style for every summary table
+TABLE_STYLE_STD = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+])
 
 # Ensure output directory exists
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Email export columns, in the tuple order read_email_data() returns
+EMAIL_COLUMNS = ('message_id', 'timestamp', 'sender', 'recipients',
+                 'subject', 'body', 'has_attachment', 'custodian')
+(E_MESSAGE_ID, E_TIMESTAMP, E_SENDER, E_RECIPIENTS,
+ E_SUBJECT, E_BODY, E_HAS_ATTACHMENT, E_CUSTODIAN) = range(len(EMAIL_COLUMNS))
+
+# evidence/email_summary.csv columns (no body text)
+EMAIL_SUMMARY_HEADER = ('message_id', 'timestamp', 'sender', 'recipients',
+                        'subject', 'has_attachment', 'custodian', 'categories')
+
+
+def dumps_canonical(obj):
+    """
+    Sorted-key, 2-space-indented UTF-8 JSON; orjson when available.
+    
+    Both paths give the same bytes for str, bool, None, list, dict and
+    64-bit ints, which is all the slack summary and manifest hold. Floats
+    are not safe (orjson writes 1e20 where json writes 1e+20), and orjson
+    rejects wider ints, so keep both out of pack JSON or the pack hash would
+    depend on whether orjson is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False, separators=(',', ': ')).encode('utf-8')
+
+
 def read_email_data():
     """Read and parse email CSV."""
     if not EMAIL_CSV.exists():
         raise FileNotFoundError(f"Email export not found: {EMAIL_CSV}")
     
-    emails = []
-    with open(EMAIL_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            emails.append(row)
-    return emails
+    with open(EMAIL_CSV, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = {name: i for i, name in enumerate(header)}
+        missing = [name for name in EMAIL_COLUMNS if name not in idx]
+        if missing:
+            raise ValueError(f"Email export is missing columns: {', '.join(missing)}")
+        # Rows become tuples in EMAIL_COLUMNS order, indexed by the E_* constants
+        pick = itemgetter(*(idx[name] for name in EMAIL_COLUMNS))
+        return [pick(row) for row in reader]
 
 
 def read_slack_data():
@@ -75,128 +158,255 @@ def read_slack_data():
     return data
 
 
-def categorize_email(email):
-    """Categorize email based on keyword rules."""
-    categories = []
-    text = (email.get('subject', '') + ' ' + email.get('body', '')).lower()
-    
-    if 'recommend' in text:
-        categories.append('Recommendation language')
-    if 'allocation' in text:
-        categories.append('Allocation language')
-    if 'performance' in text:
-        categories.append('Performance language')
-    if any(kw in text for kw in ['gmail', 'email me', 'send this later']):
-        categories.append('Non-firm channel references')
-    if email.get('has_attachment', '').lower() == 'true':
-        categories.append('Has attachment')
-    if email.get('custodian', '') == 'Supervisory Principal':
-        categories.append('Supervisory involvement')
-    
-    return categories if categories else ['Uncategorized']
-
-
-def categorize_slack_message(msg):
-    """Categorize Slack message based on keyword rules."""
-    categories = []
-    text = msg.get('text', '').lower()
-    
-    if 'recommend' in text:
-        categories.append('Recommendation language')
-    if 'allocation' in text:
-        categories.append('Allocation language')
-    if 'performance' in text:
-        categories.append('Performance language')
-    if any(kw in text for kw in ['gmail', 'email me', 'send this later']):
-        categories.append('Non-firm channel references')
+# Category names, interned so Counter lookups and comparisons hit on identity
+CAT_RECOMMENDATION = sys.intern('Recommendation language')
+CAT_ALLOCATION = sys.intern('Allocation language')
+CAT_PERFORMANCE = sys.intern('Performance language')
+CAT_NON_FIRM = sys.intern('Non-firm channel references')
+CAT_ATTACHMENT = sys.intern('Has attachment')
+CAT_SUPERVISORY = sys.intern('Supervisory involvement')
+CAT_UNCATEGORIZED = sys.intern('Uncategorized')
+
+# Keyword rules: keyword -> category
+KW_TO_CAT = {
+    'recommend': CAT_RECOMMENDATION,
+    'allocation': CAT_ALLOCATION,
+    'performance': CAT_PERFORMANCE,
+    'gmail': CAT_NON_FIRM,
+    'email me': CAT_NON_FIRM,
+    'send this later': CAT_NON_FIRM,
+}
+KEYWORD_CATEGORIES = list(dict.fromkeys(KW_TO_CAT.values()))  # reporting order
+# One case-insensitive scan finds every keyword; the zero-width lookahead
+# lets overlapping keywords all match. re.ASCII keeps case folding to A-Z so
+# every hit lowercases back to a KW_TO_CAT key ('ſ', 'İ' and 'ı' would not).
+KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(kw) for kw in KW_TO_CAT) + '))',
+    re.IGNORECASE | re.ASCII
+)
+
+
+def keyword_categories(text):
+    """Return keyword-rule categories found in text, in reporting order."""
+    hits = {KW_TO_CAT[m.group(1).lower()] for m in KEYWORD_RE.finditer(text)}
+    return [cat for cat in KEYWORD_CATEGORIES if cat in hits]
+
+
+def keyword_categories_batch(texts):
+    """
+    keyword_categories() for many texts at once.
+    
+    The texts are joined into one NUL-separated corpus and scanned with a
+    single regex sweep; each hit is mapped back to its text by offset.
+    """
+    starts = list(accumulate((len(t) + 1 for t in texts), initial=0))
+    hits = [set() for _ in texts]
+    for m in KEYWORD_RE.finditer('\0'.join(texts)):
+        hits[bisect_right(starts, m.start()) - 1].add(KW_TO_CAT[m.group(1).lower()])
+    return [[cat for cat in KEYWORD_CATEGORIES if cat in h] for h in hits]
+
+
+# CSV spellings of a set boolean flag
+TRUTHY = frozenset({'true', 't', '1', 'yes'})
+
+
+def is_truthy(value):
+    """CSV boolean check; the first-character test skips lower() for most false values."""
+    return bool(value) and value[0] in 'tT1yY' and value.lower() in TRUTHY
+
+
+def email_text(email):
+    """Text the email keyword rules apply to."""
+    return email[E_SUBJECT] + ' ' + email[E_BODY]
+
+
+def categorize_email(email, keyword_hits=None):
+    """Categorize email based on keyword rules (keyword_hits: precomputed keyword categories)."""
+    if keyword_hits is None:
+        keyword_hits = keyword_categories(email_text(email))
+    categories = list(keyword_hits)
+    
+    if is_truthy(email[E_HAS_ATTACHMENT]):
+        categories.append(CAT_ATTACHMENT)
+    if email[E_CUSTODIAN] == 'Supervisory Principal':
+        categories.append(CAT_SUPERVISORY)
+    
+    return categories if categories else [CAT_UNCATEGORIZED]
+
+
+def categorize_slack_message(msg, keyword_hits=None):
+    """Categorize Slack message based on keyword rules (keyword_hits: precomputed keyword categories)."""
+    if keyword_hits is None:
+        keyword_hits = keyword_categories(msg.get('text', ''))
+    categories = list(keyword_hits)
+    
     if msg.get('has_attachment', False):
-        categories.append('Has attachment')
+        categories.append(CAT_ATTACHMENT)
     if msg.get('custodian', '') == 'Supervisory Principal':
-        categories.append('Supervisory involvement')
-    
-    return categories if categories else ['Uncategorized']
-
-
-def generate_email_summary(emails):
-    """Generate sanitized email summary (no body text)."""
-    summary = []
-    for email in emails:
-        categories = categorize_email(email)
-        summary.append({
-            'message_id': email.get('message_id', ''),
-            'timestamp': email.get('timestamp', ''),
-            'sender': email.get('sender', ''),
-            'recipients': email.get('recipients', ''),
-            'subject': email.get('subject', ''),
-            'has_attachment': email.get('has_attachment', ''),
-            'custodian': email.get('custodian', ''),
-            'categories': '; '.join(categories)
-        })
-    return summary
-
-
-def generate_slack_summary(slack_data):
-    """Generate sanitized Slack summary (no full text)."""
-    summary = {
+        categories.append(CAT_SUPERVISORY)
+    
+    return categories if categories else [CAT_UNCATEGORIZED]
+
+
+def email_summary_row(email, categories):
+    """Sanitized email summary row (no body text), in EMAIL_SUMMARY_HEADER order."""
+    return (
+        email[E_MESSAGE_ID],
+        email[E_TIMESTAMP],
+        email[E_SENDER],
+        email[E_RECIPIENTS],
+        email[E_SUBJECT],
+        email[E_HAS_ATTACHMENT],
+        email[E_CUSTODIAN],
+        '; '.join(categories)
+    )
+
+
+def slack_summary_row(msg, categories, text):
+    """Sanitized Slack summary row (no full text); text is the message's text field."""
+    # Sanitize: only include first 100 chars of text
+    text_preview = text[:100] + ('...' if len(text) > 100 else '')
+    
+    return {
+        'message_id': msg.get('message_id', ''),
+        'timestamp': msg.get('timestamp', ''),
+        'user': msg.get('user', ''),
+        'custodian': msg.get('custodian', ''),
+        'text_preview': text_preview,
+        'has_attachment': msg.get('has_attachment', False),
+        'categories': categories
+    }
+
+
+def aggregate_emails(emails):
+    """
+    Categorize a run of emails and count them.
+    
+    Returns (email_summary, custodian_counts, category_counts). Top-level so
+    it can be shipped to worker processes.
+    """
+    # Counter(iterable) counts in C rather than one Python increment per email
+    custodian_counts = Counter(map(itemgetter(E_CUSTODIAN), emails))
+    category_counts = Counter()
+    
+    email_summary = []
+    email_hits = keyword_categories_batch([email_text(email) for email in emails])
+    for email, keyword_hits in zip(emails, email_hits):
+        categories = categorize_email(email, keyword_hits)
+        email_summary.append(email_summary_row(email, categories))
+        category_counts.update(categories)
+    
+    return email_summary, custodian_counts, category_counts
+
+
+def aggregate_emails_parallel(emails, workers):
+    """aggregate_emails() over contiguous chunks in worker processes, merged in order."""
+    chunk_size = -(-len(emails) // workers)
+    chunks = [emails[i:i + chunk_size] for i in range(0, len(emails), chunk_size)]
+    
+    email_summary = []
+    custodian_counts = Counter()
+    category_counts = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for summary, custodians, categories in executor.map(aggregate_emails, chunks):
+            email_summary.extend(summary)
+            custodian_counts.update(custodians)
+            category_counts.update(categories)
+    
+    return email_summary, custodian_counts, category_counts
+
+
+def aggregate(emails, slack_data, workers=1):
+    """
+    Categorize every record once and build summaries and counts in a single pass.
+    
+    Emails are split across `workers` processes for large exports.
+    Returns (email_summary, slack_summary, custodian_counts, category_counts,
+    email_count, slack_count).
+    """
+    if workers > 1 and len(emails) > PARALLEL_MIN_EMAILS:
+        email_summary, custodian_counts, category_counts = aggregate_emails_parallel(emails, workers)
+    else:
+        email_summary, custodian_counts, category_counts = aggregate_emails(emails)
+    
+    slack_summary = {
         'workspace': slack_data.get('workspace', ''),
         'time_window': slack_data.get('time_window', {}),
         'channels': []
     }
-    
+    slack_count = 0
+    # Each message's text is looked up once and shared by categorization and preview
+    slack_texts = [
+        msg.get('text', '')
+        for channel in slack_data.get('channels', [])
+        for msg in channel.get('messages', [])
+    ]
+    slack_records = zip(slack_texts, keyword_categories_batch(slack_texts))
     for channel in slack_data.get('channels', []):
+        messages = channel.get('messages', [])
         channel_summary = {
             'name': channel.get('name', ''),
-            'message_count': len(channel.get('messages', [])),
+            'message_count': len(messages),
             'messages': []
         }
         
-        for msg in channel.get('messages', []):
-            categories = categorize_slack_message(msg)
-            # Sanitize: only include first 100 chars of text
-            text_preview = msg.get('text', '')[:100]
-            if len(msg.get('text', '')) > 100:
-                text_preview += '...'
-            
-            channel_summary['messages'].append({
-                'message_id': msg.get('message_id', ''),
-                'timestamp': msg.get('timestamp', ''),
-                'user': msg.get('user', ''),
-                'custodian': msg.get('custodian', ''),
-                'text_preview': text_preview,
-                'has_attachment': msg.get('has_attachment', False),
-                'categories': categories
-            })
+        for msg in messages:
+            text, keyword_hits = next(slack_records)
+            categories = categorize_slack_message(msg, keyword_hits)
+            channel_summary['messages'].append(slack_summary_row(msg, categories, text))
+            custodian_counts[msg.get('custodian', 'Unknown')] += 1
+            category_counts.update(categories)
         
-        summary['channels'].append(channel_summary)
+        slack_count += len(messages)
+        slack_summary['channels'].append(channel_summary)
     
-    return summary
+    return email_summary, slack_summary, custodian_counts, category_counts, len(emails), slack_count
 
 
 def get_time_window(emails, slack_data):
     """Extract time window from data."""
-    email_times = [e.get('timestamp', '') for e in emails if e.get('timestamp')]
-    slack_times = []
-    for channel in slack_data.get('channels', []):
-        for msg in channel.get('messages', []):
-            if msg.get('timestamp'):
-                slack_times.append(msg.get('timestamp'))
-    
-    all_times = email_times + slack_times
-    if not all_times:
+    def dates():
+        # Timestamps are ISO-style (YYYY-MM-DD...), so the date is the first 10 chars
+        for email in emails:
+            t = email[E_TIMESTAMP]
+            if t:
+                yield t[:10]
+        for channel in slack_data.get('channels', []):
+            for msg in channel.get('messages', []):
+                t = msg.get('timestamp')
+                if t:
+                    yield t[:10]
+    
+    lo = hi = None
+    for d in dates():
+        if lo is None or d < lo:
+            lo = d
+        if hi is None or d > hi:
+            hi = d
+    
+    if lo is None:
         return '2024-01-01', '2024-02-15'
-    
-    # Extract date portion (assume format YYYY-MM-DD)
-    dates = [t.split()[0] if ' ' in t else t.split('T')[0] for t in all_times if t]
-    return min(dates), max(dates)
+    return lo, hi
+
+
+def deterministic_canvas(*args, **kwargs):
+    """Canvas that emits fixed CreationDate/ModDate; the document's invariant=1 fixes the trailer ID."""
+    canv = canvas.Canvas(*args, **kwargs)
+    canv.setDateFormatter(lambda *timestamp: PDF_DATE)
+    return canv
 
 
-def generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end):
+def generate_pdf(pack_id, time_window_start, time_window_end,
+                 custodian_counts, category_counts, email_count, slack_count):
     """Generate Response_Pack.pdf with exact outline."""
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter,
                             rightMargin=72, leftMargin=72,
                             topMargin=72, bottomMargin=18,
-                            pageCompression=0)
+                            pageCompression=0,
+                            # ReportLab's public reproducible-output switch:
+                            # the trailer /ID is derived from content, not the clock
+                            invariant=1)
     
     # Set fixed metadata for determinism
     doc.title = "SEC Inquiry Response Pack"
@@ -205,29 +415,9 @@ def generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end
     doc.creator = "IRP Generator"
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Title style
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#000000'),
-        spaceAfter=30,
-        alignment=1  # Center
-    )
-    
-    # Heading style
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#000000'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
-    
-    # Normal style
+    styles = PDF_STYLES
+    title_style = TITLE_STYLE
+    heading_style = HEADING_STYLE
     normal_style = styles['Normal']
     
     # Cover Page
@@ -262,21 +452,11 @@ def generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end
     # Input files table
     input_data = [
         ['Input File', 'Record Count', 'Time Range'],
-        ['email_export.csv', str(len(emails)), f"{time_window_start} to {time_window_end}"],
-        ['slack_export.json', str(sum(len(ch.get('messages', [])) for ch in slack_data.get('channels', []))), f"{time_window_start} to {time_window_end}"]
+        ['email_export.csv', str(email_count), f"{time_window_start} to {time_window_end}"],
+        ['slack_export.json', str(slack_count), f"{time_window_start} to {time_window_end}"]
     ]
     input_table = Table(input_data, colWidths=[3*inch, 1.5*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
+    input_table.setStyle(TABLE_STYLE_STD)
     story.append(input_table)
     story.append(Spacer(1, 0.3*inch))
     
@@ -294,38 +474,17 @@ def generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end
     story.append(Paragraph("Summary of Observations", heading_style))
     
     # Count by custodian
-    custodian_counts = {}
-    for email in emails:
-        cust = email.get('custodian', 'Unknown')
-        custodian_counts[cust] = custodian_counts.get(cust, 0) + 1
-    for channel in slack_data.get('channels', []):
-        for msg in channel.get('messages', []):
-            cust = msg.get('custodian', 'Unknown')
-            custodian_counts[cust] = custodian_counts.get(cust, 0) + 1
-    
     cust_data = [['Custodian', 'Total Communications']]
     for cust, count in sorted(custodian_counts.items()):
         cust_data.append([cust, str(count)])
     
     cust_table = Table(cust_data, colWidths=[3*inch, 2*inch])
-    cust_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
+    cust_table.setStyle(TABLE_STYLE_STD)
     story.append(Paragraph("Counts by Custodian", styles['Heading3']))
     story.append(cust_table)
     story.append(Spacer(1, 0.2*inch))
     
     # Count by system
-    email_count = len(emails)
-    slack_count = sum(len(ch.get('messages', [])) for ch in slack_data.get('channels', []))
     system_data = [
         ['System', 'Total Communications'],
         ['Email', str(email_count)],
@@ -333,49 +492,18 @@ def generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end
         ['Total', str(email_count + slack_count)]
     ]
     system_table = Table(system_data, colWidths=[3*inch, 2*inch])
-    system_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
+    system_table.setStyle(TABLE_STYLE_STD)
     story.append(Paragraph("Counts by System", styles['Heading3']))
     story.append(system_table)
     story.append(Spacer(1, 0.2*inch))
     
     # Count by category
-    category_counts = {}
-    for email in emails:
-        categories = categorize_email(email)
-        for cat in categories:
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-    for channel in slack_data.get('channels', []):
-        for msg in channel.get('messages', []):
-            categories = categorize_slack_message(msg)
-            for cat in categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-    
     cat_data = [['Category', 'Count']]
     for cat, count in sorted(category_counts.items()):
         cat_data.append([cat, str(count)])
     
     cat_table = Table(cat_data, colWidths=[3*inch, 2*inch])
-    cat_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-    ]))
+    cat_table.setStyle(TABLE_STYLE_STD)
     story.append(Paragraph("Counts by Category", styles['Heading3']))
     story.append(cat_table)
     story.append(Spacer(1, 0.3*inch))
@@ -410,7 +538,7 @@ def generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end
         normal_style
     ))
     
-    doc.build(story)
+    doc.build(story, canvasmaker=deterministic_canvas)
     return buffer.getvalue()
 
 
@@ -474,15 +602,20 @@ Verify the integrity of files in the response pack against manifest.json
 
 import json
 import hashlib
+import mmap
 import os
 from pathlib import Path
 
 def sha256_file(filepath):
     \"\"\"Calculate SHA256 hash of a file.\"\"\"
-    sha256 = hashlib.sha256()
     with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            sha256.update(chunk)
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        sha256 = hashlib.sha256()
+        # Older Pythons: map the file and hash it as one contiguous buffer
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                sha256.update(mapped)
     return sha256.hexdigest()
 
 def main():
@@ -532,46 +665,67 @@ if __name__ == '__main__':
 
 
 def calculate_file_hash(content):
-    """Calculate SHA256 hash of content."""
-    return hashlib.sha256(content).hexdigest()
+    """Calculate SHA256 hash of content without copying it."""
+    sha256 = hashlib.sha256()
+    sha256.update(memoryview(content))
+    return sha256.hexdigest()
 
 
-def normalize_pdf_bytes(pdf_bytes):
-    """Normalize volatile PDF metadata fields for determinism."""
-    # Normalize CreationDate - PDF format: D:YYYYMMDDHHmmSSOHH'mm'
-    pdf_bytes = re.sub(
-        rb'/CreationDate\s*\(D:[^)]+\)',
-        rb'/CreationDate (D:20240215000000-05\'00\')',
-        pdf_bytes
-    )
-    # Normalize ModDate - PDF format: D:YYYYMMDDHHmmSSOHH'mm'
-    pdf_bytes = re.sub(
-        rb'/ModDate\s*\(D:[^)]+\)',
-        rb'/ModDate (D:20240215000000-05\'00\')',
-        pdf_bytes
-    )
-    # Normalize trailer ID - replace with fixed deterministic ID
-    # Pattern: /ID [<hex_string><hex_string>]
-    fixed_id = b'<8D5041468D5041468D5041468D504146>'
-    pdf_bytes = re.sub(
-        rb'/ID\s*\[\s*<[^>]+>\s*<[^>]+>\s*\]',
-        rb'/ID [' + fixed_id + b' ' + fixed_id + b']',
-        pdf_bytes
-    )
-    return pdf_bytes
+class HashingWriter(io.RawIOBase):
+    """Writable stream that SHA256-hashes bytes on their way to a sink."""
+    
+    def __init__(self, sink):
+        self.sink = sink
+        self.sha256 = hashlib.sha256()
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.sha256.update(data)
+        return self.sink.write(data)
+    
+    def hexdigest(self):
+        return self.sha256.hexdigest()
 
 
-def write_zip_entry(zipf, path, data_bytes):
-    """Write a ZIP entry with fixed deterministic metadata."""
+@contextmanager
+def open_zip_entry(zipf, path, file_size=0):
+    """Open a ZIP entry with fixed deterministic metadata as a hashing writer."""
     zip_info = zipfile.ZipInfo(path, ZIP_TIMESTAMP)
     zip_info.compress_type = zipfile.ZIP_DEFLATED
     zip_info.create_system = 0
     zip_info.external_attr = 0o644 << 16
-    zipf.writestr(zip_info, data_bytes)
+    # A known size lets zipfile switch to ZIP64 headers only when needed
+    zip_info.file_size = file_size
+    with zipf.open(zip_info, 'w') as dest:
+        yield HashingWriter(dest)
 
 
-def main():
+def write_zip_entry(zipf, path, data_bytes):
+    """Stream a ZIP entry in chunks and return its SHA256."""
+    view = memoryview(data_bytes)
+    with open_zip_entry(zipf, path, len(view)) as writer:
+        for start in range(0, len(view), ZIP_CHUNK_SIZE):
+            writer.write(view[start:start + ZIP_CHUNK_SIZE])
+    return writer.hexdigest()
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Generate the SEC Inquiry Response Pack demo ZIP.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f"processes used to categorize emails when there are more than "
+                             f"{PARALLEL_MIN_EMAILS} (default: 1)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+
+def main(argv=None):
     """Main function to generate the response pack."""
+    args = parse_args(argv)
     # Preflight validation
     if not EMAIL_CSV.exists():
         print(f"Error: Required input file not found: {EMAIL_CSV}")
@@ -595,76 +749,58 @@ def main():
         time_window_start, time_window_end = get_time_window(emails, slack_data)
         
         print("Generating summaries...")
-        # Generate summaries
-        email_summary = generate_email_summary(emails)
-        slack_summary = generate_slack_summary(slack_data)
-        
-        print("Generating PDF...")
-        # Generate PDF
-        pdf_content = generate_pdf(emails, slack_data, pack_id, time_window_start, time_window_end)
-        # Normalize PDF for determinism
-        pdf_content = normalize_pdf_bytes(pdf_content)
-        
-        print("Generating methodology and verify script...")
-        # Generate methodology.md
-        methodology_content = generate_methodology_md().encode('utf-8')
-        
-        # Generate verify.py
-        verify_content = generate_verify_py().encode('utf-8')
-        
-        print("Creating evidence summaries...")
-        # Generate email summary CSV (sort for determinism)
-        email_summary_buffer = BytesIO()
-        if email_summary:
-            # Sort by message_id for deterministic output
-            email_summary_sorted = sorted(email_summary, key=lambda x: x.get('message_id', ''))
-            fieldnames = list(email_summary_sorted[0].keys())
-            text_buffer = io.TextIOWrapper(email_summary_buffer, encoding='utf-8', newline='')
-            writer = csv.DictWriter(text_buffer, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(email_summary_sorted)
-            text_buffer.flush()
-            text_buffer.detach()
-        email_summary_content = email_summary_buffer.getvalue()
-        
-        # Generate slack summary JSON (deterministic with sort_keys)
-        slack_summary_content = json.dumps(slack_summary, indent=2, sort_keys=True, ensure_ascii=False, separators=(',', ': ')).encode('utf-8')
+        # Categorize once and build summaries plus all counts in one pass
+        (email_summary, slack_summary, custodian_counts, category_counts,
+         email_count, slack_count) = aggregate(emails, slack_data, args.workers)
         
+        # Stream each payload straight into the ZIP (deterministic: sorted
+        # order, same compression, fixed timestamps), hashing as it is written
         print("Building ZIP file...")
-        # Calculate hashes before creating ZIP (deterministic)
-        file_contents = {
-            'Response_Pack.pdf': pdf_content,
-            'methodology.md': methodology_content,
-            'verify.py': verify_content,
-            'evidence/email_summary.csv': email_summary_content,
-            'evidence/slack_summary.json': slack_summary_content
-        }
-        
-        # Generate manifest (exclude manifest from itself)
         manifest = {}
-        for filename, content in sorted(file_contents.items()):
-            manifest[filename] = calculate_file_hash(content)
-        
-        # Add manifest JSON to file contents (deterministic with sort_keys and stable separators)
-        manifest_json = json.dumps(manifest, indent=2, sort_keys=True, separators=(',', ': ')).encode('utf-8')
+        with zipfile.ZipFile(OUTPUT_ZIP, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            print("Generating PDF...")
+            pdf_content = generate_pdf(pack_id, time_window_start, time_window_end,
+                                       custodian_counts, category_counts, email_count, slack_count)
+            manifest['Response_Pack.pdf'] = write_zip_entry(zipf, 'Response_Pack.pdf', pdf_content)
+            del pdf_content
+            
+            print("Creating evidence summaries...")
+            # Email summary CSV (sorted for determinism), encoded to UTF-8 in one go
+            csv_buffer = io.StringIO(newline='')
+            if email_summary:
+                # Sort by message_id for deterministic output
+                email_summary.sort(key=itemgetter(0))
+                csv_writer = csv.writer(csv_buffer)
+                csv_writer.writerow(EMAIL_SUMMARY_HEADER)
+                csv_writer.writerows(email_summary)
+            manifest['evidence/email_summary.csv'] = write_zip_entry(
+                zipf, 'evidence/email_summary.csv', csv_buffer.getvalue().encode('utf-8'))
+            del csv_buffer
+            
+            # Slack summary JSON (deterministic with sort_keys)
+            slack_summary_content = dumps_canonical(slack_summary)
+            manifest['evidence/slack_summary.json'] = write_zip_entry(
+                zipf, 'evidence/slack_summary.json', slack_summary_content)
+            del slack_summary_content
+            
+            print("Generating methodology and verify script...")
+            manifest['methodology.md'] = write_zip_entry(
+                zipf, 'methodology.md', generate_methodology_md().encode('utf-8'))
+            manifest['verify.py'] = write_zip_entry(
+                zipf, 'verify.py', generate_verify_py().encode('utf-8'))
+            
+            # Manifest goes last, built from the digests accumulated above
+            manifest_json = dumps_canonical(manifest)
+            manifest_hash = write_zip_entry(zipf, 'manifest.json', manifest_json)
         
-        # Print file hash report before zipping
+        # Print file hash report
         print("\nFILE_SHA256 report:")
-        all_files = {**file_contents, 'manifest.json': manifest_json}
-        for filename in sorted(all_files.keys()):
-            file_hash = calculate_file_hash(all_files[filename])
+        for filename, file_hash in sorted({**manifest, 'manifest.json': manifest_hash}.items()):
             print(f"FILE_SHA256 {filename} {file_hash}")
         
-        # Create ZIP file (deterministic: same order, same compression, fixed timestamps)
-        with zipfile.ZipFile(OUTPUT_ZIP, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add files in deterministic order using helper function
-            for filename in sorted(file_contents.keys()):
-                write_zip_entry(zipf, filename, file_contents[filename])
-            write_zip_entry(zipf, 'manifest.json', manifest_json)
-        
         # Calculate and print ZIP hash for verification
         with open(OUTPUT_ZIP, 'rb') as f:
-            zip_hash = hashlib.sha256(f.read()).hexdigest()
+            zip_hash = hashlib.file_digest(f, 'sha256').hexdigest()
         
         print()
         print(f"✓ Successfully generated SEC Inquiry Response Pack")
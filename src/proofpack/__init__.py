@@ -1,4 +1,4 @@
-from src.proofpack.builder import build_proof_pack
+from src.proofpack.builder import build_proof_pack, build_proof_packs
 
-__all__ = ["build_proof_pack"]
+__all__ = ["build_proof_pack", "build_proof_packs"]
 
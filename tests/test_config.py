@@ -0,0 +1,37 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import Settings
+
+
+@pytest.mark.parametrize("url,expected", [
+    ("postgres://u:p@db:5432/app", "postgresql+asyncpg://u:p@db:5432/app"),
+    ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ("postgresql://u:p@db/app?sslmode=require", "postgresql+asyncpg://u:p@db/app?ssl=require"),
+    ("postgres://u:p@db/app?sslmode=verify-full&target_session_attrs=read-write",
+     "postgresql+asyncpg://u:p@db/app?ssl=verify-full&target_session_attrs=read-write"),
+    ("sqlite+aiosqlite:///x.db?sslmode=require", "sqlite+aiosqlite:///x.db?sslmode=require"),
+])
+def test_database_url_is_rewritten_for_asyncpg(url, expected):
+    assert Settings(DATABASE_URL=url).DATABASE_URL == expected
+
+
+def test_sslmode_reaches_asyncpg_as_ssl():
+    url = make_url(Settings(DATABASE_URL="postgres://u:p@db/app?sslmode=require").DATABASE_URL)
+    _, kwargs = PGDialect_asyncpg().create_connect_args(url)
+    assert kwargs["ssl"] == "require" and "sslmode" not in kwargs
+
+
+@pytest.mark.parametrize("url", [
+    "postgresql://u:p@db/app?connect_timeout=10",
+    "postgresql://u:p@db/app?sslmode=require&application_name=web",
+    "postgresql+psycopg2://u:p@db/app?options=-csearch_path%3Dapp",
+    "postgresql://u:p@db/app?sslmode=require&ssl=true",
+])
+def test_unsupported_libpq_params_are_rejected_at_startup(url):
+    with pytest.raises(ValidationError, match="DATABASE_URL"):
+        Settings(DATABASE_URL=url)
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from sqlalchemy.exc import IntegrityError
+
+from app.services import event_bus
+
+
+def test_emit_without_writer_task_inserts_inline(monkeypatch):
+    written = []
+
+    async def fake_insert(events):
+        written.append(list(events))
+
+    monkeypatch.setattr(event_bus, "_insert", fake_insert)
+    asyncio.run(event_bus.emit({"event_type": "source.created"}))
+    assert written == [[{"event_type": "source.created"}]]
+
+
+def test_transient_failure_is_retried_not_dropped(monkeypatch):
+    written = []
+    failures = [ConnectionRefusedError("db down"), ConnectionRefusedError("db down")]
+
+    async def flaky_insert(events):
+        if failures:
+            raise failures.pop()
+        written.extend(events)
+
+    monkeypatch.setattr(event_bus, "_insert", flaky_insert)
+    monkeypatch.setattr(event_bus, "RETRY_INITIAL_S", 0.001)
+
+    async def scenario():
+        event_bus.start()
+        for i in range(3):
+            await event_bus.emit({"n": i})
+        await asyncio.sleep(0.2)
+        await event_bus.stop()
+
+    asyncio.run(scenario())
+    assert written == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert event_bus._task is None
+
+
+def test_poison_event_is_dead_lettered_and_later_events_are_written(monkeypatch, caplog):
+    written = []
+
+    async def insert_rejecting_poison(events):
+        if any(e.get("poison") for e in events):
+            raise IntegrityError("INSERT INTO event_log ...", {}, Exception("violates constraint"))
+        written.extend(events)
+
+    monkeypatch.setattr(event_bus, "_insert", insert_rejecting_poison)
+
+    async def scenario():
+        event_bus.start()
+        await event_bus.emit({"n": 0})
+        await event_bus.emit({"n": 1, "poison": True})
+        await event_bus.emit({"n": 2})
+        await asyncio.sleep(0.2)
+        await event_bus.emit({"n": 3})
+        await asyncio.wait_for(event_bus.stop(), 5)
+
+    with caplog.at_level(logging.ERROR, logger=event_bus.dead_letter_logger.name):
+        asyncio.run(scenario())
+    assert written == [{"n": 0}, {"n": 2}, {"n": 3}]
+    dead = [r.getMessage() for r in caplog.records if r.name == event_bus.dead_letter_logger.name]
+    assert dead == ['{"n":1,"poison":true}']
+
+
+def test_stop_gives_up_on_a_database_that_stays_down(monkeypatch, caplog):
+    async def always_down(events):
+        raise ConnectionRefusedError("db down")
+
+    monkeypatch.setattr(event_bus, "_insert", always_down)
+    monkeypatch.setattr(event_bus, "RETRY_INITIAL_S", 0.01)
+    monkeypatch.setattr(event_bus, "STOP_TIMEOUT_S", 0.2)
+
+    async def scenario():
+        event_bus.start()
+        await event_bus.emit({"n": 0})
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(event_bus.stop(), 5)
+
+    with caplog.at_level(logging.ERROR, logger=event_bus.dead_letter_logger.name):
+        asyncio.run(scenario())
+    dead = [r.getMessage() for r in caplog.records if r.name == event_bus.dead_letter_logger.name]
+    assert dead == ['{"n":0}']
+    assert event_bus._task is None
@@ -0,0 +1,34 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import fetcher
+
+
+def _die():
+    os._exit(1)
+
+
+def test_cpu_pool_is_replaced_after_a_worker_dies():
+    async def scenario():
+        fetcher.start()
+        try:
+            broken = fetcher._cpu_pool
+            with pytest.raises(BrokenProcessPool):
+                await asyncio.get_running_loop().run_in_executor(broken, _die)
+            result = await fetcher._run_in_cpu_pool(fetcher._process, b"<p>hi</p>", "text/html")
+            assert fetcher._cpu_pool is not broken
+            return result
+        finally:
+            await fetcher.stop()
+
+    result = asyncio.run(scenario())
+    assert result["normalized_text_sha256"] == fetcher.sha256_hex(b"hi")
+    assert fetcher._client is None and fetcher._cpu_pool is None
+
+
+def test_fetch_url_before_start_is_an_internal_error():
+    with pytest.raises(fetcher.FetcherInternalError):
+        asyncio.run(fetcher.fetch_url("https://example.com/"))
@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "irp_demo" / "scripts"))
+
+import generate_irp_demo as irp  # noqa: E402
+
+
+def test_dumps_canonical_fallback_matches_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    payload = {
+        "pack_name": "SEC_Response_Pack_Demo",
+        "files": [{"path": "evidence/slack_summary.json", "sha256": "ab" * 32, "bytes": 1234}],
+        "counts": {"Uncategorized": 0, "Performance language": 2**63 - 1},
+        "flags": [True, False, None],
+        "note": "non-ASCII – “quoted” text",
+    }
+    with_orjson = irp.dumps_canonical(payload)
+    monkeypatch.setattr(irp, "orjson", None)
+    assert irp.dumps_canonical(payload) == with_orjson
@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "irp_demo" / "scripts"))
+
+import generate_irp_demo as irp  # noqa: E402
+
+
+def baseline_keyword_categories(text):
+    """The original rules: lowercase the text, then substring-test each keyword."""
+    text = text.lower()
+    hits = {cat for kw, cat in irp.KW_TO_CAT.items() if kw in text}
+    return [cat for cat in irp.KEYWORD_CATEGORIES if cat in hits]
+
+
+# Non-ASCII characters that case-fold onto ASCII letters under Unicode rules
+UNICODE_FOLDS = ["ſend this later", "gmaİl", "gmaıl", "ALLOCATİON", "ſ", "İ", "ı", "K"]
+
+
+@pytest.mark.parametrize("text", UNICODE_FOLDS + [
+    "Please RECOMMEND the allocation",
+    "gmail / Email Me / send this later",
+    "performanceallocation",
+    "",
+])
+def test_keyword_categories_match_baseline(text):
+    assert irp.keyword_categories(text) == baseline_keyword_categories(text)
+
+
+def test_keyword_categories_every_single_character_substitution():
+    # Swap each keyword character for every code point that case-maps onto
+    # it; the regex must agree with lower() + `in` and never raise.
+    lookalikes = {}
+    for cp in range(sys.maxunicode + 1):
+        ch = chr(cp)
+        for mapped in {ch.lower(), ch.upper(), ch.casefold()}:
+            if len(mapped) == 1 and mapped.isascii():
+                lookalikes.setdefault(mapped.lower(), set()).add(ch)
+    texts = []
+    for kw in irp.KW_TO_CAT:
+        for i, c in enumerate(kw):
+            texts.extend(kw[:i] + alt + kw[i + 1:] for alt in lookalikes.get(c, ()))
+    for text in texts:
+        assert irp.keyword_categories(text) == baseline_keyword_categories(text), text
+    assert irp.keyword_categories_batch(texts) == [baseline_keyword_categories(t) for t in texts]
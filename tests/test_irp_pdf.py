@@ -0,0 +1,17 @@
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "irp_demo" / "scripts"))
+
+import generate_irp_demo as irp  # noqa: E402
+
+ARGS = ("IRP-TEST-0001", "2024-01-02T09:00:00", "2024-01-31T17:00:00",
+        {"Alice": 3}, {irp.CAT_RECOMMENDATION: 2}, 3, 4)
+
+
+def test_pdf_is_reproducible():
+    pdf = irp.generate_pdf(*ARGS)
+    assert irp.generate_pdf(*ARGS) == pdf
+    assert pdf.count(f"({irp.PDF_DATE})".encode()) == 2  # CreationDate and ModDate
+    assert re.search(rb"/ID\s*\[<[0-9a-f]{32}>\s*<[0-9a-f]{32}>\]", pdf, re.IGNORECASE)
@@ -0,0 +1,43 @@
+import pytest
+
+from app.services.fetcher import _process, normalize_body, normalize_html_to_text, sha256_hex
+
+HTML = b"<html><head><title>T</title></head><body><p>Hello\n  <b>world</b></p><script>x()</script></body></html>"
+
+
+@pytest.mark.parametrize("content_type", [
+    "text/html",
+    "text/html; charset=utf-8",
+    "TEXT/HTML",
+    "application/xhtml+xml",
+    None,
+    "",
+])
+def test_html_and_unlabelled_bodies_get_visible_text(content_type):
+    assert normalize_body(HTML, content_type) == normalize_html_to_text(HTML) == b"T Hello world"
+
+
+@pytest.mark.parametrize("content_type", ["application/rss+xml", "application/xml", "text/xml; charset=utf-8"])
+def test_xml_is_tag_stripped(content_type):
+    xml = b"<rss><item><title><![CDATA[Hi]]></title>\n<link>https://example.com/</link></item></rss>"
+    assert normalize_body(xml, content_type) == b"Hi https://example.com/"
+
+
+def test_text_plain_with_charset_collapses_whitespace_only():
+    raw = b"  a &amp; <b>\tb\r\n\n c  "
+    assert normalize_body(raw, "text/plain; charset=utf-8") == b"a &amp; <b> b c"
+
+
+def test_json_is_hashed_raw():
+    raw = b'{"a": [1,  2],\n "b": "<i>x</i>"}'
+    assert normalize_body(raw, "application/json; charset=utf-8") == raw
+
+
+@pytest.mark.parametrize("content_type", ["application/pdf", "image/png", "application/octet-stream"])
+def test_binary_types_hash_raw_bytes_not_the_failed_fetch_digest(content_type):
+    raw = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n1 0 obj"
+    processed = _process(raw, content_type)
+    assert normalize_body(raw, content_type) == raw
+    assert processed["normalized_text_sha256"] == processed["raw_bytes_sha256"] == sha256_hex(raw)
+    assert processed["normalized_text_sha256"] != sha256_hex(b"")
+    assert processed["normalized_text_len"] == len(raw)
@@ -0,0 +1,61 @@
+import pytest
+
+from app.services.fetcher import _normalize_html_to_text_bs4, normalize_html_to_text
+
+# Ordinary markup: lexbor and the old BeautifulSoup html.parser path agree
+SAME = [
+    b"<html><head><title>T</title></head><body><p>Hello <b>world</b></p></body></html>",
+    b"<html><body><p>Hi</p><script>var x = 1;</script><style>p {}</style></body></html>",
+    b"<p>a &amp; b &nbsp; c &copy; &#128512;</p>",
+    b"<div>a<div>b</div>c</div><!-- comment -->",
+    b"<p>a</p>\n\n<p>b</p>",
+    b"<ul><li>a<li>b</ul><table><tr><td>c<td>d</table>",
+    b"<svg><text>s</text></svg><math><mi>m</mi></math>",
+    b"<p>bad <b>nest</p> ing</b>",
+    b"<select><option>o1<option>o2</select>",
+    b"<br>a<br/>b<hr>c",
+    b"<body><noscript><p>n</p></noscript>ok</body>",
+    b"\xef\xbb\xbf<p>BOM-prefixed</p>",
+    b"plain text, no tags",
+    b"",
+]
+
+# Known differences (see README, "Text normalization"): (html, lexbor, html.parser)
+DIFFERENT = [
+    (b"<textarea><b>raw</b></textarea>", b"<b>raw</b>", b"raw"),
+    (b"<p>x</p><iframe><b>f</b></iframe>", b"x <b>f</b>", b"x f"),
+    (b"<noframes><b>n</b></noframes>", b"<b>n</b>", b"n"),
+    (b"<xmp><b>x</b></xmp>", b"<b>x</b>", b"x"),
+    (b"<plaintext><b>p</b>", b"<b>p</b>", b"p"),
+    (b"<p>a<![CDATA[cdata]]>b</p>", b"a b", b"a cdata b"),
+    (b"<html><body>a</body></html>trailing", b"atrailing", b"a trailing"),
+    (b"<p>&notanentity;</p>", "¬anentity;".encode(), b"&notanentity"),
+]
+
+
+@pytest.mark.parametrize("html", SAME)
+def test_lexbor_matches_html_parser(html):
+    assert normalize_html_to_text(html) == _normalize_html_to_text_bs4(html)
+
+
+@pytest.mark.parametrize("html,lexbor,html_parser", DIFFERENT)
+def test_known_differences_from_html_parser(html, lexbor, html_parser):
+    assert normalize_html_to_text(html) == lexbor
+    assert _normalize_html_to_text_bs4(html) == html_parser
+
+
+def test_non_utf8_falls_back_to_html_parser():
+    html = '<meta charset="latin-1"><p>café</p>'.encode("latin-1")
+    assert normalize_html_to_text(html) == _normalize_html_to_text_bs4(html) == "café".encode()
+
+
+@pytest.mark.parametrize("html", [
+    b"<noscript>n</noscript>ok",
+    b"<style>s</style><noscript><p>n</p></noscript>ok",
+    b"<head><noscript>n</noscript></head><body>ok</body>",
+    b"<head><noscript><link rel=x>n</noscript></head><body>ok</body>",
+    b"<body><noscript><p>n</p></noscript>ok</body>",
+    b"<p>ok</p><noscript>n</noscript>",
+])
+def test_noscript_content_is_removed(html):
+    assert normalize_html_to_text(html) == b"ok"
@@ -0,0 +1,34 @@
+import io
+import zipfile
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from src.proofpack.builder import ZIP_DATE_TIME, _assemble_pack, _timeline_items
+
+SOURCE_ID = "11111111-2222-3333-4444-555555555555"
+
+
+def _captures(n):
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        (f"00000000-0000-0000-0000-{i:012d}", None, t0 + timedelta(hours=i),
+         f"{i:064x}", f"{i + 1:064x}", f"{i + 2:064x}")
+        for i in range(n)
+    ]
+
+
+def test_timeline_is_deflated_at_level_1_with_fixed_metadata():
+    zip_bytes, _ = _assemble_pack(SOURCE_ID, _timeline_items("https://example.com/", _captures(200)))
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+        timeline = zf.read("timeline.json")
+
+    deflater = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+    level_1 = deflater.compress(timeline) + deflater.flush()
+    assert infos["timeline.json"].compress_type == zipfile.ZIP_DEFLATED
+    assert infos["timeline.json"].compress_size == len(level_1)
+    for name, info in infos.items():
+        if name != "timeline.json":
+            assert info.compress_type == zipfile.ZIP_STORED, name
+        assert (info.date_time, info.create_system, info.external_attr) == (
+            ZIP_DATE_TIME, 0, 0o644 << 16), name